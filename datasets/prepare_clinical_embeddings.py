@@ -18,34 +18,54 @@ Output:
 Usage:
     python prepare_clinical_embeddings.py          # Download all 3 models
     python prepare_clinical_embeddings.py --model w2v_100d_oa_cr  # Download one
+    python prepare_clinical_embeddings.py --dtype int8             # Quantized vectors
+
+Archives are downloaded over parallel ranged connections into the cache directory,
+so rerunning after an interruption resumes where it stopped. Servers without byte
+range support are extracted straight from the network stream instead.
 
 Requirements:
-    pip install gensim pyarrow pandas requests tqdm
+    pip install gensim numpy pyarrow requests tqdm
 """
 
 import os
 import sys
+import json
+import queue
+import logging
+import logging.handlers
+import hashlib
+import functools
+import struct
+import threading
+import multiprocessing
 import tarfile
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import argparse
 
 # Check for required packages
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     from tqdm import tqdm
-    import pandas as pd
+    import numpy as np
     import pyarrow as pa
     import pyarrow.parquet as pq
-    from gensim.models import Word2Vec, KeyedVectors
+    from gensim.models import KeyedVectors
 except ImportError as e:
     print(f"Missing required package: {e}")
-    print("Install with: pip install gensim pyarrow pandas requests tqdm")
+    print("Install with: pip install gensim numpy pyarrow requests tqdm")
     sys.exit(1)
 
 
+log = logging.getLogger('clinical_embeddings')
+
+
 # Download URLs from https://github.com/gweissman/clinical_embeddings
 # Using Box.com shared links - Word2Vec models only
 DOWNLOAD_URLS = {
@@ -59,35 +79,390 @@ DOWNLOAD_URLS = {
     "w2v_300d_oa_all": "https://upenn.box.com/shared/static/9djgjigsve09a7f9vz6ubtsovqwb40xa.gz",
 }
 
+# Pinned SHA-256 digests of the archives above, checked as each download is written.
+# Models without an entry are only checked against the size the server reports.
+KNOWN_SHA256 = {}
+
 # Default models to download (all Case Reports dimensions)
 DEFAULT_MODELS = ["w2v_100d_oa_cr", "w2v_300d_oa_cr", "w2v_600d_oa_cr"]
 
+# Bytes read per iteration when streaming downloads. Small chunks leave us paying
+# interpreter and progress-bar overhead per few KiB; ~1 MiB keeps that negligible.
+HTTP_CHUNK_SIZE = 1024 * 1024
+
+# (connect, read) timeouts in seconds for HTTP requests
+HTTP_TIMEOUT = (10, 60)
+
+# macOS fcntl(F_PREALLOCATE) request and flags from <sys/fcntl.h>
+_F_PREALLOCATE = 42
+_F_ALLOCATECONTIG = 0x2
+_F_ALLOCATEALL = 0x4
+_F_PEOFPOSMODE = 3
+
+# Concurrent archive downloads; kept low so we don't hammer the Box.com host
+MAX_CONCURRENT_DOWNLOADS = 2
+
+# Parallel ranged connections per archive download (--connections)
+DEFAULT_CONNECTIONS = 4
+MAX_CONNECTIONS = 16
+
+# Storage types for the parquet vector column, selected with --dtype
+VECTOR_DTYPES = {
+    'float32': pa.float32(),
+    'int8': pa.int8(),
+}
+
+# Parquet codecs offered by --compression; zstd compresses the word column far better than snappy
+PARQUET_COMPRESSIONS = ['zstd', 'snappy', 'gzip', 'brotli', 'lz4', 'none']
+DEFAULT_COMPRESSION = 'zstd'
+DEFAULT_ZSTD_LEVEL = 3
+
+# Written into an extract directory once extraction completed successfully
+EXTRACT_SENTINEL = '.ok'
+
+# Rows per parquet row group; bounds the memory held while encoding each group
+DEFAULT_ROW_GROUP_SIZE = 65536
+
+
+class _TqdmLoggingHandler(logging.Handler):
+    """Emit records through tqdm.write so they don't break progress bars being drawn."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            tqdm.write(self.format(record), file=sys.stderr)
+        except Exception:
+            self.handleError(record)
+
+
+def _configure_logging(level: int) -> None:
+    """Route this script's log output through tqdm."""
+    handler = _TqdmLoggingHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    log.handlers = [handler]
+    log.setLevel(level)
+    log.propagate = False
+
+
+def _configure_worker_logging(log_queue, level: int) -> None:
+    """
+    Send a conversion worker's log records to the parent process instead of
+    writing them itself, so they are printed between the parent's progress bars
+    rather than interleaved with them and with other workers' output.
+    """
+    log.handlers = [logging.handlers.QueueHandler(log_queue)]
+    log.setLevel(level)
+    log.propagate = False
+
+
+def _progress_bar(total: int, desc: str, position: int = 0) -> tqdm:
+    """
+    Byte progress bar, hidden when the log level hides informational output.
+    
+    Concurrent downloads each pass their own position so their bars are drawn on
+    separate lines instead of over each other.
+    """
+    return tqdm(
+        total=total,
+        unit='B',
+        unit_scale=True,
+        desc=desc,
+        position=position,
+        disable=not log.isEnabledFor(logging.INFO),
+    )
+
+
+def _create_session() -> requests.Session:
+    """Create an HTTP session that keeps connections alive and retries transient failures."""
+    session = requests.Session()
+    retries = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_maxsize=MAX_CONCURRENT_DOWNLOADS * MAX_CONNECTIONS, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
-def download_file(url: str, dest_path: Path, desc: str = "Downloading") -> None:
-    """Download a file with progress bar."""
-    response = requests.get(url, stream=True, allow_redirects=True)
-    response.raise_for_status()
+
+# Shared by all downloads so the TLS connection to the host is reused between models
+_SESSION = _create_session()
+
+
+@functools.lru_cache(maxsize=None)
+def _probe(url: str) -> Tuple[int, bool]:
+    """
+    HEAD a URL and return its size (0 if unknown) and whether it serves byte ranges.
+    
+    Cached, so validating a cached archive and then downloading it costs one HEAD.
+    """
+    head = _SESSION.head(url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    head.raise_for_status()
+    total_size = int(head.headers.get('Content-Length', 0))
+    accepts_ranges = head.headers.get('Accept-Ranges', '').lower() == 'bytes'
+    return total_size, accepts_ranges
+
+
+def _preallocate(f, size: int) -> None:
+    """
+    Reserve size bytes for an open file up front so the filesystem can lay it out
+    in as few extents as possible. Best effort: unsupported platforms or
+    filesystems simply skip it.
+    """
+    try:
+        if hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(f.fileno(), 0, size)
+        elif sys.platform == 'darwin':
+            import fcntl
+            # fstore_t {fst_flags, fst_posmode, fst_offset, fst_length, fst_bytesalloc};
+            # ask for one contiguous extent first, then settle for any allocation.
+            # F_PREALLOCATE reserves blocks without changing the file size.
+            for flags in (_F_ALLOCATECONTIG | _F_ALLOCATEALL, _F_ALLOCATEALL):
+                fstore = struct.pack('Iiqqq', flags, _F_PEOFPOSMODE, 0, size, 0)
+                try:
+                    fcntl.fcntl(f.fileno(), _F_PREALLOCATE, fstore)
+                    break
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+
+class _RangeNotSupported(Exception):
+    """Raised when a ranged request is answered with the whole file instead of 206."""
+
+
+def _fetch_segment(
+    url: str,
+    fd: int,
+    segment: List[int],
+    save_progress,
+    stop: threading.Event,
+    cancel: Optional[threading.Event],
+) -> None:
+    """
+    Download bytes [segment[0], segment[1]) into fd at their own offsets.
+    
+    save_progress(segment, written) is called after every chunk; it advances
+    segment[0] and keeps the shared resume state and progress bar current. The
+    segment ends early once stop (another segment failed) or cancel is set.
+    """
+    start, end = segment
+    headers = {'Range': f'bytes={start}-{end - 1}'}
+    with _SESSION.get(url, headers=headers, stream=True, allow_redirects=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise _RangeNotSupported(url)
+        for chunk in response.iter_content(chunk_size=HTTP_CHUNK_SIZE):
+            if stop.is_set() or (cancel is not None and cancel.is_set()):
+                return
+            if chunk:
+                os.pwrite(fd, chunk, segment[0])
+                save_progress(segment, len(chunk))
+
+
+def _save_segment_state(state_path: Path, total_size: int, segments: List[List[int]]) -> None:
+    """Replace the resume sidecar atomically, so a kill mid-write never leaves it truncated."""
+    tmp_path = state_path.with_name(state_path.name + '.tmp')
+    tmp_path.write_text(json.dumps({'total': total_size, 'segments': segments}))
+    os.replace(tmp_path, state_path)
+
+
+def _load_segment_state(state_path: Path, total_size: int) -> Optional[List[List[int]]]:
+    """Remaining [start, end) of each segment, or None when there is no usable sidecar."""
+    try:
+        state = json.loads(state_path.read_text())
+        if state['total'] != total_size:
+            return None
+        return [[int(start), int(end)] for start, end in state['segments']]
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError):
+        # Unparseable state can only be restarted from scratch
+        log.warning(f"Ignoring corrupt download state {state_path}; restarting the download")
+        return None
+
+
+def _download_segmented(
+    url: str,
+    part_path: Path,
+    total_size: int,
+    connections: int,
+    pbar,
+    cancel: Optional[threading.Event] = None,
+) -> None:
+    """
+    Download url into part_path over several ranged connections.
+    
+    The file is preallocated and each connection writes its own byte range. The
+    remaining range of every segment is tracked in a JSON sidecar, so an interrupted
+    download resumes each segment where it stopped.
+    """
+    state_path = part_path.with_name(part_path.name + '.json')
+    
+    segments = _load_segment_state(state_path, total_size) if part_path.exists() else None
+    if segments is None:
+        step = -(-total_size // connections)
+        segments = [[start, min(start + step, total_size)] for start in range(0, total_size, step)]
+        with open(part_path, 'wb') as f:
+            _preallocate(f, total_size)
+            # Size the file so every segment writes inside it
+            f.truncate(total_size)
+        _save_segment_state(state_path, total_size, segments)
+    
+    pbar.update(total_size - sum(end - start for start, end in segments))
+    
+    lock = threading.Lock()
+    stop = threading.Event()
+    
+    def save_progress(segment: List[int], written: int) -> None:
+        with lock:
+            segment[0] += written
+            _save_segment_state(state_path, total_size, segments)
+            pbar.update(written)
     
-    total_size = int(response.headers.get('content-length', 0))
-    block_size = 8192
+    fd = os.open(part_path, os.O_WRONLY)
+    try:
+        with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+            futures = [
+                pool.submit(_fetch_segment, url, fd, segment, save_progress, stop, cancel)
+                for segment in segments
+                if segment[0] < segment[1]
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                stop.set()
+                raise
+    finally:
+        os.close(fd)
+    
+    if any(start < end for start, end in segments):
+        raise IOError(f"Ranged download of {url} ended early; rerun to resume")
+    state_path.unlink()
+
+
+def _download_sequential(url: str, part_path: Path, pbar, cancel: Optional[threading.Event] = None) -> str:
+    """
+    Download url into part_path over a single connection, from the start, stopping
+    at the next chunk once cancel is set.
     
-    with open(dest_path, 'wb') as f:
-        with tqdm(total=total_size, unit='B', unit_scale=True, desc=desc) as pbar:
-            for chunk in response.iter_content(chunk_size=block_size):
+    Returns:
+        SHA-256 hex digest of the downloaded bytes, hashed as they are written
+    """
+    digest = hashlib.sha256()
+    with _SESSION.get(url, stream=True, allow_redirects=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        if pbar.total == 0:
+            pbar.total = int(response.headers.get('content-length', 0))
+            pbar.refresh()
+        
+        with open(part_path, 'wb') as f:
+            if pbar.total:
+                _preallocate(f, pbar.total)
+            for chunk in response.iter_content(chunk_size=HTTP_CHUNK_SIZE):
+                if cancel is not None and cancel.is_set():
+                    raise IOError(f"Download of {url} was cancelled")
                 if chunk:
                     f.write(chunk)
+                    digest.update(chunk)
                     pbar.update(len(chunk))
+            # Drop any preallocated tail so a short download shows up as a short file
+            f.truncate(f.tell())
+    
+    return digest.hexdigest()
 
 
-def extract_tar_gz(tar_path: Path, extract_dir: Path) -> Path:
-    """Extract a tar.gz file and return path to main extracted file."""
-    print(f"Extracting {tar_path}...")
-    with tarfile.open(tar_path, "r:gz") as tar:
-        tar.extractall(extract_dir)
-        # Find the .bin file
-        for member in tar.getmembers():
-            if member.name.endswith('.bin'):
-                return extract_dir / member.name
+def _sha256_file(path: Path) -> str:
+    """Hash a file on disk in HTTP_CHUNK_SIZE reads."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HTTP_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _verify_sha256(actual: str, expected: Optional[str], what: str) -> None:
+    if expected is not None and actual != expected:
+        raise ValueError(f"Checksum mismatch for {what}: expected sha256 {expected}, got {actual}")
+
+
+def download_file(
+    url: str,
+    dest_path: Path,
+    desc: str = "Downloading",
+    connections: int = DEFAULT_CONNECTIONS,
+    expected_sha256: Optional[str] = None,
+    position: int = 0,
+    cancel: Optional[threading.Event] = None,
+) -> str:
+    """
+    Download a file with progress bar.
+    
+    Bytes go to a '.part' file next to dest_path, which is renamed into place once
+    complete. When the server serves byte ranges the file is fetched over
+    `connections` parallel ranged requests, and an interrupted download resumes
+    from where each range stopped. Otherwise, or when the HEAD probe fails, it
+    falls back to one plain GET.
+    
+    The result is checked against the size the server reported and, when given,
+    expected_sha256; a bad download is deleted rather than renamed into place.
+    Setting cancel stops the download at its next chunk.
+    
+    Returns:
+        SHA-256 hex digest of the downloaded file
+    """
+    try:
+        total_size, accepts_ranges = _probe(url)
+    except requests.RequestException as e:
+        # Some servers reject HEAD (403/405) but serve GET; fall back to one plain
+        # GET, which sizes the progress bar from its own response headers
+        log.warning(f"HEAD {url} failed ({e}); downloading without ranges")
+        total_size, accepts_ranges = 0, False
+    part_path = dest_path.with_name(dest_path.name + '.part')
+    
+    with _progress_bar(total_size, desc, position) as pbar:
+        if accepts_ranges and total_size > 0 and hasattr(os, 'pwrite'):
+            try:
+                _download_segmented(url, part_path, total_size, connections, pbar, cancel)
+                # Ranges arrive out of order, so hash the finished file; it is still in the page cache
+                sha256 = _sha256_file(part_path)
+            except _RangeNotSupported:
+                # The server advertised ranges but ignored them; fetch the whole file instead
+                part_path.with_name(part_path.name + '.json').unlink(missing_ok=True)
+                pbar.reset()
+                sha256 = _download_sequential(url, part_path, pbar, cancel)
+        else:
+            sha256 = _download_sequential(url, part_path, pbar, cancel)
+    
+    try:
+        actual_size = part_path.stat().st_size
+        if total_size and actual_size != total_size:
+            raise IOError(f"Download of {url} is truncated: got {actual_size} of {total_size} bytes")
+        _verify_sha256(sha256, expected_sha256, url)
+    except (IOError, ValueError):
+        part_path.unlink()
+        raise
+    
+    os.replace(part_path, dest_path)
+    return sha256
+
+
+def _extract_members(tar: tarfile.TarFile, extract_dir: Path) -> Path:
+    """
+    Extract every member of a tar in a single forward pass.
+    
+    Works with streaming ('r|gz') archives: the .bin model file is picked out while
+    extracting, so the archive is never rewound or decompressed a second time.
+    
+    Returns:
+        Path to the main extracted file
+    """
+    bin_path = None
+    for member in tar:
+        tar.extract(member, extract_dir)
+        if bin_path is None and member.isfile() and member.name.endswith('.bin'):
+            bin_path = extract_dir / member.name
+    
+    if bin_path is not None:
+        return bin_path
     
     # Return first file if no .bin found
     for f in extract_dir.iterdir():
@@ -96,59 +471,397 @@ def extract_tar_gz(tar_path: Path, extract_dir: Path) -> Path:
     raise FileNotFoundError("No model file found in archive")
 
 
-def load_word2vec_model(model_path: Path) -> dict:
-    """Load a Word2Vec model and return word -> vector dictionary."""
-    print(f"Loading Word2Vec model from {model_path}...")
+class _ProgressReader:
+    """
+    File-like wrapper that advances a progress bar and a digest as bytes are read
+    through it, and fails the next read once cancel is set.
+    """
+
+    def __init__(self, raw, pbar, cancel: Optional[threading.Event] = None):
+        self._raw = raw
+        self._pbar = pbar
+        self._cancel = cancel
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        if self._cancel is not None and self._cancel.is_set():
+            raise IOError("Download was cancelled")
+        data = self._raw.read(size)
+        self._pbar.update(len(data))
+        self.digest.update(data)
+        return data
+
+
+def stream_download_and_extract(
+    url: str,
+    extract_dir: Path,
+    desc: str = "Downloading",
+    expected_sha256: Optional[str] = None,
+    position: int = 0,
+    cancel: Optional[threading.Event] = None,
+) -> Path:
+    """
+    Download a tar.gz and extract it on the fly, without writing the archive to disk.
+    
+    The tar is opened in streaming mode ('r|gz'), so gunzip and extraction run as
+    the bytes arrive instead of after the whole archive has been downloaded. The
+    bytes are hashed on the way through and checked against expected_sha256.
+    Setting cancel stops the download at its next read.
+    
+    Returns:
+        Path to the main extracted file
+    """
+    with _SESSION.get(url, stream=True, allow_redirects=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        # Let urllib3 undo any transfer encoding; the tar's own gzip layer is handled by tarfile
+        response.raw.decode_content = True
+        
+        total_size = int(response.headers.get('content-length', 0))
+        with _progress_bar(total_size, desc, position) as pbar:
+            reader = _ProgressReader(response.raw, pbar, cancel)
+            with tarfile.open(fileobj=reader, mode="r|gz") as tar:
+                model_path = _extract_members(tar, extract_dir)
+            # tarfile stops at the end-of-archive marker; drain the padding and gzip
+            # trailer so the digest covers the whole download
+            while reader.read(HTTP_CHUNK_SIZE):
+                pass
+    
+    _verify_sha256(reader.digest.hexdigest(), expected_sha256, url)
+    return model_path
+
+
+def extract_tar_gz(tar_path: Path, extract_dir: Path) -> Path:
+    """Extract a tar.gz file and return path to main extracted file."""
+    log.info(f"Extracting {tar_path}...")
+    with tarfile.open(tar_path, "r|gz") as tar:
+        return _extract_members(tar, extract_dir)
+
+
+def load_word2vec_model(model_path: Path) -> KeyedVectors:
+    """
+    Load a Word2Vec model and return its word vectors.
+    
+    Native gensim models are memory-mapped (mmap='r'), so the vectors matrix is paged
+    in from the extracted .npy file as it is read instead of being copied into RAM.
+    The extract directory must therefore outlive every use of the returned vectors.
+    """
+    log.info(f"Loading Word2Vec model from {model_path}...")
     
     try:
-        # Try loading as full Word2Vec model first
-        model = Word2Vec.load(str(model_path))
-        wv = model.wv
+        # KeyedVectors.load unpickles whichever class was saved, so one call covers both
+        # bare KeyedVectors and full Word2Vec models; only the latter carries training state
+        loaded = KeyedVectors.load(str(model_path), mmap='r')
+        if isinstance(loaded, KeyedVectors):
+            wv = loaded
+        else:
+            wv = loaded.wv
+        source = f"native gensim {type(loaded).__name__}"
     except Exception:
-        try:
-            # Try loading as KeyedVectors
-            wv = KeyedVectors.load(str(model_path))
-        except Exception:
-            # Try loading as word2vec text format
-            wv = KeyedVectors.load_word2vec_format(str(model_path), binary=True)
+        # Try loading as word2vec binary format (read fully, mmap is not supported)
+        wv = KeyedVectors.load_word2vec_format(str(model_path), binary=True)
+        source = "word2vec binary format"
     
-    print(f"Loaded {len(wv.key_to_index)} words, {wv.vector_size} dimensions")
+    log.info(f"Loaded {len(wv.key_to_index)} words, {wv.vector_size} dimensions ({source})")
     return wv
 
 
-def embeddings_to_parquet(wv, output_path: Path) -> None:
-    """Convert word embeddings to parquet format."""
-    print(f"Converting embeddings to parquet format...")
+def _encode_rows(rows: np.ndarray, dtype: str) -> Tuple[pa.Array, Optional[pa.Array]]:
+    """
+    Encode a block of float32 rows as the flat values of the vector column.
     
-    words = list(wv.key_to_index.keys())
-    vectors = [wv[word].tolist() for word in words]
+    Returns the values array and, for int8, the per-row scale column; a reader
+    recovers the float vector as values * scale.
+    """
+    scale = None
+    if dtype == 'int8':
+        row_scale = (np.abs(rows).max(axis=1) / 127.0).astype(np.float32)
+        # All-zero rows quantize to zeros under any scale; avoid dividing by zero
+        row_scale[row_scale == 0] = 1.0
+        rows = np.round(rows / row_scale[:, None]).astype(np.int8)
+        scale = pa.array(row_scale, type=pa.float32())
     
-    # Create DataFrame
-    df = pd.DataFrame({
-        'word': words,
-        'vector': vectors,
-        'dimension': [wv.vector_size] * len(words)
-    })
+    values = pa.Array.from_buffers(VECTOR_DTYPES[dtype], rows.size, [None, pa.py_buffer(rows)])
+    return values, scale
+
+
+def embeddings_to_parquet(
+    wv,
+    output_path: Path,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    dtype: str = 'float32',
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = None,
+) -> None:
+    """
+    Convert word embeddings to parquet format.
     
-    # Save to parquet with compression
-    df.to_parquet(output_path, compression='snappy', index=False)
+    Vectors are handed to Arrow straight from gensim's contiguous (N, D) float32
+    matrix, so no per-word Python lists or floats are ever materialized. Rows are
+    written in row groups of row_group_size, so only one group is being encoded at
+    a time and readers can load the file group by group.
+    
+    dtype selects how vector components are stored: 'float32' as-is, or 'int8'
+    quantized with a per-row float32 'scale' column.
+    
+    compression_level is passed to the codec; when omitted zstd uses level 3 and
+    other codecs their own default.
+    """
+    log.info(f"Converting embeddings to parquet format ({dtype})...")
+    
+    # Row i of wv.vectors is the vector of wv.index_to_key[i], so both are consumed
+    # positionally instead of looking words up one at a time
+    mat = np.ascontiguousarray(wv.vectors, dtype=np.float32)
+    words = wv.index_to_key
+    dimension = wv.vector_size
+    if mat.shape != (len(words), dimension):
+        raise ValueError(f"Vectors matrix has shape {mat.shape}, expected ({len(words)}, {dimension})")
+    
+    # Build the word column once (large_string: 64-bit offsets, no 2 GB limit on the
+    # total bytes); each row group then takes a zero-copy slice of it
+    word_arr = pa.array(words, type=pa.large_string())
+    
+    fields = [
+        pa.field('word', pa.large_string()),
+        pa.field('vector', pa.list_(VECTOR_DTYPES[dtype], dimension)),
+    ]
+    if dtype == 'int8':
+        fields.append(pa.field('scale', pa.float32(), nullable=False))
+    
+    # The dimension is a single constant, so it lives in file metadata rather than a column
+    schema = pa.schema(
+        fields,
+        metadata={b'dimension': str(dimension).encode(), b'dtype': dtype.encode()},
+    )
+    
+    if compression_level is None and compression == 'zstd':
+        compression_level = DEFAULT_ZSTD_LEVEL
+    
+    # Written under a temporary name and renamed once complete, so a failed or
+    # interrupted conversion never leaves a partial file that looks finished
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    try:
+        # Only the word column is worth a dictionary attempt; on float vectors it just
+        # burns CPU before falling back to plain encoding
+        with pq.ParquetWriter(
+            tmp_path,
+            schema,
+            compression=compression,
+            compression_level=compression_level,
+            use_dictionary=['word'],
+            write_statistics=True,
+        ) as writer:
+            for start in range(0, len(words), row_group_size):
+                end = min(start + row_group_size, len(words))
+                # Slicing a C-contiguous matrix by rows is a view, so float32 output wraps without copying
+                values, scale = _encode_rows(mat[start:end], dtype)
+                columns = [
+                    word_arr.slice(start, end - start),
+                    pa.FixedSizeListArray.from_arrays(values, dimension),
+                ]
+                if scale is not None:
+                    columns.append(scale)
+                writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, output_path)
     
     file_size_mb = output_path.stat().st_size / (1024 * 1024)
-    print(f"Saved {len(words)} word embeddings to {output_path} ({file_size_mb:.1f} MB)")
+    log.info(f"Saved {len(words)} word embeddings to {output_path} ({file_size_mb:.1f} MB)")
+
+
+def _resolve_dirs(output_dir: Optional[Path], cache_dir: Optional[Path]) -> Tuple[Path, Path]:
+    """Apply directory defaults and make sure both directories exist."""
+    if output_dir is None:
+        output_dir = Path.cwd()
+    if cache_dir is None:
+        cache_dir = Path.home() / ".cache" / "clinical_embeddings"
+    
+    output_dir = Path(output_dir)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir, cache_dir
+
+
+def _output_path(output_dir: Path, model_key: str) -> Path:
+    return output_dir / f"{model_key}_embeddings.parquet"
+
+
+def _sha256_sidecar(archive_path: Path) -> Path:
+    return archive_path.with_name(archive_path.name + '.sha256')
+
+
+def _cached_archive_is_valid(url: str, archive_path: Path, expected_sha256: Optional[str]) -> bool:
+    """
+    Check a cached archive before extracting it.
+    
+    The size must match what the server reports, and the archive is re-hashed and
+    compared with the digest recorded in its sidecar when it was downloaded and,
+    for models with a pinned digest, with the pin.
+    """
+    try:
+        total_size, _ = _probe(url)
+    except requests.RequestException as e:
+        # Offline: the archive was size-checked when it was downloaded
+        log.warning(f"Could not reach {url} to validate {archive_path} ({e}); using it as-is")
+        total_size = 0
+    
+    if total_size and archive_path.stat().st_size != total_size:
+        return False
+    
+    sidecar = _sha256_sidecar(archive_path)
+    recorded_sha256 = sidecar.read_text().strip() if sidecar.exists() else None
+    if recorded_sha256 is None and expected_sha256 is None:
+        # Nothing to compare against; the size check is all we have
+        return True
+    
+    actual_sha256 = _sha256_file(archive_path)
+    return all(digest in (None, actual_sha256) for digest in (recorded_sha256, expected_sha256))
+
+
+def _is_resumable(url: str) -> bool:
+    """Whether download_file can fetch url in resumable ranged segments."""
+    try:
+        total_size, accepts_ranges = _probe(url)
+    except requests.RequestException:
+        return False
+    return accepts_ranges and total_size > 0 and hasattr(os, 'pwrite')
+
+
+def _download_and_extract(
+    model_key: str,
+    cache_dir: Path,
+    keep_archive: bool,
+    connections: int = DEFAULT_CONNECTIONS,
+    position: int = 0,
+    cancel: Optional[threading.Event] = None,
+) -> Path:
+    """
+    Fetch a model archive (or reuse the cached one), extract it and return the model file path.
+    
+    position is the line its progress bar is drawn on; setting cancel stops the
+    download at its next chunk.
+    
+    When the server serves byte ranges the archive is downloaded to cache_dir over
+    parallel, resumable connections and removed after extraction unless
+    keep_archive is set; otherwise it is extracted straight from the network stream.
+    
+    A completed extraction is marked with a sentinel file holding the model file's
+    relative path; when it is present the extracted tree is reused as-is.
+    """
+    url = DOWNLOAD_URLS[model_key]
+    archive_path = cache_dir / f"{model_key}.tar.gz"
+    
+    extract_dir = cache_dir / model_key
+    sentinel = extract_dir / EXTRACT_SENTINEL
+    if sentinel.exists():
+        model_path = extract_dir / sentinel.read_text().strip()
+        if model_path.exists():
+            log.info(f"Using extracted model: {model_path}")
+            return model_path
+    
+    # No sentinel means a previous extraction never finished; start from a clean tree
+    if extract_dir.exists():
+        shutil.rmtree(extract_dir)
+    extract_dir.mkdir(parents=True, exist_ok=True)
+    
+    expected_sha256 = KNOWN_SHA256.get(model_key)
+    if archive_path.exists() and not _cached_archive_is_valid(url, archive_path, expected_sha256):
+        log.warning(f"Discarding invalid cached archive: {archive_path}")
+        archive_path.unlink()
+        _sha256_sidecar(archive_path).unlink(missing_ok=True)
+    
+    if archive_path.exists():
+        log.info(f"Using cached archive: {archive_path}")
+        model_path = extract_tar_gz(archive_path, extract_dir)
+    elif keep_archive or _is_resumable(url):
+        # Going through a '.part' file costs disk space for the archive, but lets a
+        # killed run resume instead of restarting the download from byte 0
+        log.info(f"Downloading {model_key} embeddings...")
+        sha256 = download_file(
+            url,
+            archive_path,
+            desc=f"Downloading {model_key}",
+            connections=connections,
+            expected_sha256=expected_sha256,
+            position=position,
+            cancel=cancel,
+        )
+        _sha256_sidecar(archive_path).write_text(sha256)
+        model_path = extract_tar_gz(archive_path, extract_dir)
+        if not keep_archive:
+            archive_path.unlink()
+            _sha256_sidecar(archive_path).unlink()
+    else:
+        log.info(f"Downloading and extracting {model_key} embeddings...")
+        model_path = stream_download_and_extract(
+            url,
+            extract_dir,
+            desc=f"Downloading {model_key}",
+            expected_sha256=expected_sha256,
+            position=position,
+            cancel=cancel,
+        )
+    
+    sentinel.write_text(str(model_path.relative_to(extract_dir)))
+    return model_path
+
+
+def _convert(
+    model_path: Path,
+    output_file: Path,
+    row_group_size: int,
+    dtype: str,
+    compression: str,
+    compression_level: Optional[int],
+) -> Path:
+    """
+    Load an extracted model and write it as parquet.
+    
+    Kept at module level so it can be shipped to a worker process.
+    """
+    wv = load_word2vec_model(model_path)
+    embeddings_to_parquet(
+        wv,
+        output_file,
+        row_group_size=row_group_size,
+        dtype=dtype,
+        compression=compression,
+        compression_level=compression_level,
+    )
+    return output_file
 
 
 def prepare_clinical_embeddings(
     model_key: str,
     output_dir: Optional[Path] = None,
     cache_dir: Optional[Path] = None,
+    keep_archive: bool = False,
+    keep_extracted: bool = False,
+    connections: int = DEFAULT_CONNECTIONS,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    dtype: str = 'float32',
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = None,
 ) -> Path:
     """
     Download clinical embeddings and convert to parquet format.
     
+    Everything runs in the calling process, one step after the other; the command
+    line uses prepare_models_pipelined to overlap several models.
+    
     Args:
         model_key: Which model to download (e.g., 'w2v_100d_oa_cr')
         output_dir: Directory for output parquet file
         cache_dir: Directory to cache downloaded files
+        keep_archive: Keep the downloaded archive in cache_dir for later runs
+        keep_extracted: Keep the extracted model in cache_dir so later runs skip extraction
+        connections: Parallel ranged connections per archive download
+        row_group_size: Rows per parquet row group
+        dtype: Storage type for vectors ('float32' or 'int8')
+        compression: Parquet compression codec
+        compression_level: Codec level (default: 3 for zstd, codec default otherwise)
     
     Returns:
         Path to the output parquet file
@@ -156,52 +869,128 @@ def prepare_clinical_embeddings(
     if model_key not in DOWNLOAD_URLS:
         raise ValueError(f"Unknown model: {model_key}. Available: {list(DOWNLOAD_URLS.keys())}")
     
-    # Setup directories
-    if output_dir is None:
-        output_dir = Path.cwd()
-    if cache_dir is None:
-        cache_dir = Path.home() / ".cache" / "clinical_embeddings"
-    
-    output_dir = Path(output_dir)
-    cache_dir = Path(cache_dir)
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    output_file = output_dir / f"{model_key}_embeddings.parquet"
+    output_dir, cache_dir = _resolve_dirs(output_dir, cache_dir)
+    output_file = _output_path(output_dir, model_key)
     
     # Check if output already exists
     if output_file.exists():
-        print(f"Output file already exists: {output_file}")
+        log.info(f"Output file already exists: {output_file}")
         return output_file
     
-    # Download the model archive
-    url = DOWNLOAD_URLS[model_key]
-    archive_path = cache_dir / f"{model_key}.tar.gz"
+    model_path = _download_and_extract(model_key, cache_dir, keep_archive, connections)
+    _convert(model_path, output_file, row_group_size, dtype, compression, compression_level)
     
-    if not archive_path.exists():
-        print(f"Downloading {model_key} embeddings...")
-        download_file(url, archive_path, desc=f"Downloading {model_key}")
-    else:
-        print(f"Using cached archive: {archive_path}")
+    # Cleanup extracted files (a cached archive, if any, is kept)
+    if not keep_extracted:
+        shutil.rmtree(cache_dir / model_key)
     
-    # Extract the archive
-    extract_dir = cache_dir / model_key
-    if extract_dir.exists():
-        shutil.rmtree(extract_dir)
-    extract_dir.mkdir(parents=True, exist_ok=True)
+    return output_file
+
+
+def prepare_models_pipelined(
+    model_keys: List[str],
+    output_dir: Optional[Path] = None,
+    cache_dir: Optional[Path] = None,
+    keep_archive: bool = False,
+    keep_extracted: bool = False,
+    connections: int = DEFAULT_CONNECTIONS,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    dtype: str = 'float32',
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = None,
+    jobs: int = 1,
+) -> List[Path]:
+    """
+    Prepare several models, overlapping downloads with conversions.
     
-    model_path = extract_tar_gz(archive_path, extract_dir)
+    Downloads are network-bound and run on a small thread pool; each model is
+    handed to a pool of `jobs` worker processes for conversion as soon as its
+    download finishes, so conversions run in parallel with each other and with
+    the downloads still in flight.
     
-    # Load the model
-    wv = load_word2vec_model(model_path)
+    Returns:
+        Paths to the output parquet files, in completion order
+    """
+    output_dir, cache_dir = _resolve_dirs(output_dir, cache_dir)
     
-    # Convert to parquet
-    embeddings_to_parquet(wv, output_file)
+    output_files = []
+    pending = []
+    for model_key in model_keys:
+        output_file = _output_path(output_dir, model_key)
+        if output_file.exists():
+            log.info(f"Output file already exists: {output_file}")
+            output_files.append(output_file)
+        else:
+            pending.append(model_key)
     
-    # Cleanup extracted files (keep archive for caching)
-    shutil.rmtree(extract_dir)
+    if not pending:
+        return output_files
     
-    return output_file
+    # Workers are spawned rather than forked: download threads are already running
+    # by the time the first conversion is submitted, and forking them is unsafe.
+    mp_context = multiprocessing.get_context("spawn")
+    
+    # Worker records come back over a queue and are handled by this process's logger
+    log_queue = mp_context.Queue()
+    log_listener = logging.handlers.QueueListener(log_queue, log)
+    log_listener.start()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS) as downloads, \
+                ProcessPoolExecutor(
+                    max_workers=jobs,
+                    mp_context=mp_context,
+                    initializer=_configure_worker_logging,
+                    initargs=(log_queue, log.getEffectiveLevel()),
+                ) as conversions:
+            # One progress bar line per download slot; a download borrows a free line
+            # while it runs and hands it back when done
+            bar_positions = queue.Queue()
+            for position in range(MAX_CONCURRENT_DOWNLOADS):
+                bar_positions.put(position)
+            
+            # Set on the first failure (or Ctrl-C) so running downloads stop at their next chunk
+            cancel = threading.Event()
+            
+            def download(model_key: str) -> Path:
+                position = bar_positions.get()
+                try:
+                    return _download_and_extract(model_key, cache_dir, keep_archive, connections, position, cancel)
+                finally:
+                    bar_positions.put(position)
+            
+            download_futures = {downloads.submit(download, model_key): model_key for model_key in pending}
+            
+            conversion_futures = {}
+            try:
+                for future in as_completed(download_futures):
+                    model_key = download_futures[future]
+                    model_path = future.result()
+                    log.debug(f"Queued {model_key} for conversion")
+                    output_file = _output_path(output_dir, model_key)
+                    conversion = conversions.submit(
+                        _convert, model_path, output_file, row_group_size, dtype, compression, compression_level
+                    )
+                    conversion_futures[conversion] = model_key
+                
+                for future in as_completed(conversion_futures):
+                    model_key = conversion_futures[future]
+                    output_files.append(future.result())
+                    # The extracted tree is only needed until the parquet file is written
+                    if not keep_extracted:
+                        shutil.rmtree(cache_dir / model_key)
+                    log.info(f"[OK] Created: {output_files[-1]}")
+            except BaseException:
+                # Leaving the with block waits for all submitted work; drop what hasn't
+                # started and stop what has, so the error surfaces now
+                cancel.set()
+                downloads.shutdown(wait=False, cancel_futures=True)
+                conversions.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        log_listener.stop()
+    
+    return output_files
 
 
 def main():
@@ -231,6 +1020,63 @@ def main():
         default=None,
         help="Cache directory for downloaded files (default: ~/.cache/clinical_embeddings)"
     )
+    parser.add_argument(
+        "--keep-archive",
+        action="store_true",
+        help="Keep downloaded archives in the cache directory (default: delete them once extracted)"
+    )
+    parser.add_argument(
+        "--keep-extracted",
+        action="store_true",
+        help="Keep extracted models in the cache directory so later runs skip extraction"
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help=f"Parallel connections per archive download (default: {DEFAULT_CONNECTIONS}, max: {MAX_CONNECTIONS})"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="Worker processes converting models in parallel (default: one per model, up to the CPU count)"
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help=f"Rows per parquet row group (default: {DEFAULT_ROW_GROUP_SIZE})"
+    )
+    parser.add_argument(
+        "--dtype",
+        default="float32",
+        choices=list(VECTOR_DTYPES.keys()),
+        help="Storage type for vectors; int8 adds a per-row 'scale' column (default: float32)"
+    )
+    parser.add_argument(
+        "--compression",
+        default=DEFAULT_COMPRESSION,
+        choices=PARQUET_COMPRESSIONS,
+        help=f"Parquet compression codec (default: {DEFAULT_COMPRESSION})"
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=None,
+        help=f"Compression level (default: {DEFAULT_ZSTD_LEVEL} for zstd, codec default otherwise)"
+    )
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "--quiet", "-q",
+        action="store_true",
+        help="Only report warnings and errors, without progress bars"
+    )
+    verbosity.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Also report debug details"
+    )
     parser.add_argument(
         "--list-models",
         action="store_true",
@@ -238,6 +1084,25 @@ def main():
     )
     
     args = parser.parse_args()
+    _configure_logging(logging.WARNING if args.quiet else logging.DEBUG if args.verbose else logging.INFO)
+    
+    if args.row_group_size <= 0:
+        parser.error("--row-group-size must be positive")
+    if not 1 <= args.connections <= MAX_CONNECTIONS:
+        parser.error(f"--connections must be between 1 and {MAX_CONNECTIONS}")
+    if args.jobs is not None and args.jobs <= 0:
+        parser.error("--jobs must be positive")
+    # Checked up front: otherwise a bad level only fails in the conversion worker,
+    # after the archive has already been downloaded and extracted
+    if args.compression_level is not None:
+        if args.compression == 'none' or not pa.Codec.supports_compression_level(args.compression):
+            parser.error(f"--compression-level is not supported by --compression {args.compression}")
+        min_level = pa.Codec.minimum_compression_level(args.compression)
+        max_level = pa.Codec.maximum_compression_level(args.compression)
+        if not min_level <= args.compression_level <= max_level:
+            parser.error(
+                f"--compression-level for {args.compression} must be between {min_level} and {max_level}"
+            )
     
     if args.list_models:
         print("Available models:")
@@ -257,27 +1122,29 @@ def main():
     else:
         # Default: download all 3 case reports models
         models_to_download = DEFAULT_MODELS
-        print(f"Downloading all {len(models_to_download)} case reports models (100D, 300D, 600D)...")
-        print("Use --model to download a specific model.")
-        print()
+        log.info(f"Downloading all {len(models_to_download)} case reports models (100D, 300D, 600D)...")
+        log.info("Use --model to download a specific model.\n")
     
     try:
-        for i, model_key in enumerate(models_to_download):
-            print(f"\n{'='*60}")
-            print(f"[{i+1}/{len(models_to_download)}] Processing {model_key}")
-            print(f"{'='*60}")
-            output_file = prepare_clinical_embeddings(
-                model_key=model_key,
-                output_dir=args.output_dir,
-                cache_dir=args.cache_dir,
-            )
-            print(f"[OK] Created: {output_file}")
+        output_files = prepare_models_pipelined(
+            model_keys=models_to_download,
+            output_dir=args.output_dir,
+            cache_dir=args.cache_dir,
+            keep_archive=args.keep_archive,
+            keep_extracted=args.keep_extracted,
+            connections=args.connections,
+            row_group_size=args.row_group_size,
+            dtype=args.dtype,
+            compression=args.compression,
+            compression_level=args.compression_level,
+            jobs=args.jobs or min(len(models_to_download), os.cpu_count() or 1),
+        )
         
-        print(f"\n{'='*60}")
-        print(f"[OK] Successfully created {len(models_to_download)} parquet file(s)")
-        print(f"{'='*60}")
+        log.info(f"\n{'='*60}")
+        log.info(f"[OK] Successfully created {len(output_files)} parquet file(s)")
+        log.info(f"{'='*60}")
     except Exception as e:
-        print(f"\n[FAIL] Error: {e}", file=sys.stderr)
+        log.error(f"\n[FAIL] Error: {e}")
         sys.exit(1)
 
 
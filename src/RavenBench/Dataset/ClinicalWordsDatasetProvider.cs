@@ -96,55 +96,83 @@ public sealed class ClinicalWordsDatasetProvider : IDatasetProvider
             var path = GetParquetPath();
             Console.WriteLine($"[ClinicalWords] Loading {_dimensions}D vectors from {path}");
 
-            _wordVectors = new Dictionary<string, float[]>(StringComparer.OrdinalIgnoreCase);
+            using (var stream = File.OpenRead(path))
+                _wordVectors = await ReadWordVectorsAsync(stream);
 
-            using var stream = File.OpenRead(path);
-            using var reader = await ParquetReader.CreateAsync(stream);
-            var fields = reader.Schema.GetDataFields();
+            Console.WriteLine($"[ClinicalWords] Loaded {_wordVectors.Count:N0} words");
+            return _wordVectors;
+        }
+        finally
+        {
+            _loadSemaphore.Release();
+        }
+    }
 
-            for (int rg = 0; rg < reader.RowGroupCount; rg++)
-            {
-                using var groupReader = reader.OpenRowGroupReader(rg);
-                var wordCol = await groupReader.ReadColumnAsync(fields[0]);
-                var vecCol = await groupReader.ReadColumnAsync(fields[1]);
+    /// <summary>
+    /// Decodes the word/vector parquet layout written by datasets/prepare_clinical_embeddings.py.
+    /// </summary>
+    internal static async Task<Dictionary<string, float[]>> ReadWordVectorsAsync(Stream stream)
+    {
+        var wordVectors = new Dictionary<string, float[]>(StringComparer.OrdinalIgnoreCase);
 
-                var words = (string[])wordCol.Data;
+        using var reader = await ParquetReader.CreateAsync(stream);
+        var fields = reader.Schema.GetDataFields();
+        var scaleField = fields.FirstOrDefault(f => f.Name == "scale");
 
-                // Parquet.Net returns list columns as flat double?[] - slice into chunks of _dimensions
-                if (vecCol.Data is double?[] flatVectors)
-                {
-                    int vecSize = flatVectors.Length / words.Length;
-                    for (int i = 0; i < words.Length; i++)
-                    {
-                        var vec = new float[vecSize];
-                        int offset = i * vecSize;
-                        for (int j = 0; j < vecSize; j++)
-                            vec[j] = (float)(flatVectors[offset + j] ?? 0.0);
-                        _wordVectors[words[i]] = vec;
-                    }
-                }
-                else if (vecCol.Data is double[] flatDoubles)
-                {
-                    int vecSize = flatDoubles.Length / words.Length;
-                    for (int i = 0; i < words.Length; i++)
-                    {
-                        var vec = new float[vecSize];
-                        int offset = i * vecSize;
-                        for (int j = 0; j < vecSize; j++)
-                            vec[j] = (float)flatDoubles[offset + j];
-                        _wordVectors[words[i]] = vec;
-                    }
-                }
-                else
+        for (int rg = 0; rg < reader.RowGroupCount; rg++)
+        {
+            using var groupReader = reader.OpenRowGroupReader(rg);
+            var wordCol = await groupReader.ReadColumnAsync(fields[0]);
+            var vecCol = await groupReader.ReadColumnAsync(fields[1]);
+
+            var words = (string[])wordCol.Data;
+
+            // int8-quantized files carry a per-row scale: vector = values * scale
+            float[]? scales = null;
+            if (scaleField != null)
+                scales = (float[])(await groupReader.ReadColumnAsync(scaleField)).Data;
+
+            // Parquet.Net returns list columns flattened - slice into chunks of the vector size.
+            // Older files store float64 vectors, current ones float32 or int8.
+            switch (vecCol.Data)
+            {
+                case float?[] flatFloats:
+                    AddVectors(wordVectors, words, flatFloats, v => v ?? 0f, scales);
+                    break;
+                case float[] flatFloats:
+                    AddVectors(wordVectors, words, flatFloats, v => v, scales);
+                    break;
+                case double?[] flatDoubles:
+                    AddVectors(wordVectors, words, flatDoubles, v => (float)(v ?? 0.0), scales);
+                    break;
+                case double[] flatDoubles:
+                    AddVectors(wordVectors, words, flatDoubles, v => (float)v, scales);
+                    break;
+                case sbyte?[] flatBytes when scales != null:
+                    AddVectors(wordVectors, words, flatBytes, v => v ?? 0, scales);
+                    break;
+                case sbyte[] flatBytes when scales != null:
+                    AddVectors(wordVectors, words, flatBytes, v => v, scales);
+                    break;
+                default:
                     throw new InvalidOperationException($"Unknown vector format: {vecCol.Data?.GetType()}");
             }
-
-            Console.WriteLine($"[ClinicalWords] Loaded {_wordVectors.Count:N0} words");
-            return _wordVectors;
         }
-        finally
+
+        return wordVectors;
+    }
+
+    private static void AddVectors<T>(Dictionary<string, float[]> target, string[] words, T[] flat, Func<T, float> convert, float[]? scales)
+    {
+        int vecSize = flat.Length / words.Length;
+        for (int i = 0; i < words.Length; i++)
         {
-            _loadSemaphore.Release();
+            var vec = new float[vecSize];
+            int offset = i * vecSize;
+            float scale = scales?[i] ?? 1f;
+            for (int j = 0; j < vecSize; j++)
+                vec[j] = convert(flat[offset + j]) * scale;
+            target[words[i]] = vec;
         }
     }
 
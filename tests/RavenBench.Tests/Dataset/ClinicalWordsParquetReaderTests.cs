@@ -0,0 +1,69 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Threading.Tasks;
+using RavenBench.Dataset;
+using Xunit;
+
+namespace RavenBench.Tests.Dataset;
+
+/// <summary>
+/// Decodes the small parquet fixtures written by datasets/prepare_clinical_embeddings.py
+/// (row_group_size=2, so the three words span two row groups).
+/// </summary>
+public class ClinicalWordsParquetReaderTests
+{
+    private static readonly Dictionary<string, float[]> Expected = new()
+    {
+        ["alpha"] = new[] { 1f, -2f, 0.5f, 4f },
+        ["beta"] = new[] { 0f, 0f, 0f, 0f },
+        ["gamma"] = new[] { -3.25f, 1.5f, 2f, -0.75f },
+    };
+
+    private static async Task<Dictionary<string, float[]>> ReadFixtureAsync(string dtype)
+    {
+        var path = Path.Combine(AppContext.BaseDirectory, "Dataset", "Fixtures", $"clinical_words_{dtype}.parquet");
+        using var stream = File.OpenRead(path);
+        return await ClinicalWordsDatasetProvider.ReadWordVectorsAsync(stream);
+    }
+
+    [Fact]
+    public async Task ReadWordVectors_Float32_DecodesExactValues()
+    {
+        var vectors = await ReadFixtureAsync("float32");
+
+        Assert.Equal(Expected.Count, vectors.Count);
+        foreach (var (word, expected) in Expected)
+            Assert.Equal(expected, vectors[word]);
+    }
+
+    [Fact]
+    public async Task ReadWordVectors_Int8_AppliesPerRowScale()
+    {
+        var vectors = await ReadFixtureAsync("int8");
+
+        Assert.Equal(Expected.Count, vectors.Count);
+        foreach (var (word, expected) in Expected)
+        {
+            var actual = vectors[word];
+            Assert.Equal(expected.Length, actual.Length);
+
+            // Rounding to the nearest step loses at most half a step: max(|v|) / 127 / 2
+            float maxAbs = 0f;
+            foreach (var v in expected)
+                maxAbs = Math.Max(maxAbs, Math.Abs(v));
+            float tolerance = maxAbs / 127f / 2f + 1e-6f;
+
+            for (int i = 0; i < expected.Length; i++)
+                Assert.InRange(actual[i], expected[i] - tolerance, expected[i] + tolerance);
+        }
+    }
+
+    [Fact]
+    public async Task ReadWordVectors_IsCaseInsensitive()
+    {
+        var vectors = await ReadFixtureAsync("float32");
+
+        Assert.True(vectors.ContainsKey("ALPHA"));
+    }
+}